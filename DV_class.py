@@ -1,255 +1,628 @@
-
-import streamlit as st
-import pandas as pd
-import altair as alt
-from vega_datasets import data  
-
-@st.cache_data
-def load_data():
-    df = pd.read_json("olympics.json")
-    return df
-
-def main():
-    st.set_page_config(page_title="Winter Olympics Explorer", layout="wide")
-    st.title("Winter Olympics Medal Explorer (1924 – 2006)")
-
-
-    df = load_data()
-
-    st.sidebar.header("1) Data Filters")
-
-    all_years = sorted(df["Year"].unique())
-    min_year, max_year = st.sidebar.select_slider(
-        "Select Year Range:",
-        options=all_years,
-        value=(min(all_years), max(all_years))
-    )
-
-    all_sports = sorted(df["Sport"].unique())
-    selected_sports = st.sidebar.multiselect(
-        "Select Sports:",
-        options=all_sports,
-        default=all_sports
-    )
-
-    all_countries = sorted(df["Country"].unique())
-    selected_countries = st.sidebar.multiselect(
-        "Select Countries:",
-        options=all_countries,
-        default=all_countries
-    )
-
-    all_genders = ["M", "W", "X"]
-    selected_genders = st.sidebar.multiselect(
-        "Select Genders:",
-        options=all_genders,
-        default=all_genders
-    )
-
-    df_filtered = df[
-        (df["Year"] >= min_year)
-        & (df["Year"] <= max_year)
-        & (df["Sport"].isin(selected_sports))
-        & (df["Country"].isin(selected_countries))
-        & (df["Gender"].isin(selected_genders))
-    ]
-
-    st.sidebar.markdown(f"**Records after filtering:** {len(df_filtered)}")
-
-
-    total_by_year = (
-        df_filtered
-        .groupby("Year")
-        .size()
-        .reset_index(name="TotalMedals")
-    )
-
-    medal_distribution = (
-        df_filtered
-        .groupby(["Year","Medal"])
-        .size()
-        .reset_index(name="Count")
-    )
-
-    year_country_medals = (
-        df_filtered
-        .groupby(["Year","Country"])
-        .size()
-        .reset_index(name="MedalsWon")
-    )
-
-    city_summary = (
-        df_filtered
-        .groupby(["Year","City","Latitude","Longitude"])
-        .size()
-        .reset_index(name="CityMedals")
-    )
-
-    breakdown_full = (
-        df_filtered
-        .groupby(["Year","Country","Medal"])
-        .size()
-        .reset_index(name="NumMedals")
-    )
-
-
-    st.subheader("2) Total Medals Over Time (Area Chart)")
-
-    zoom = alt.selection_interval(bind='scales', encodings=['x'])
-
-    area_chart = (
-        alt.Chart(total_by_year)
-        .mark_area(opacity=0.6)
-        .encode(
-            x=alt.X("Year:O", sort=all_years, title="Year"),
-            y=alt.Y("TotalMedals:Q", title="Total Medals"),
-            tooltip=[
-                alt.Tooltip("Year:O"),
-                alt.Tooltip("TotalMedals:Q")
-            ]
-        )
-        .add_selection(
-            zoom
-        )
-        .properties(width=600, height=300)
-    )
-    st.altair_chart(area_chart.interactive(), use_container_width=True)
-
-    st.subheader("3) Medal Distribution by Year (Stacked Bar)")
-
-    selection = alt.selection_single(
-        fields=['Year'],
-        empty='all',
-        on='click',
-        nearest=True
-    )
-
-    stacked_bar = (
-        alt.Chart(medal_distribution)
-        .mark_bar()
-        .encode(
-            x=alt.X("Year:O", sort=all_years, title="Year"),
-            y=alt.Y("Count:Q", stack="normalize", title="Proportion of Medals"),
-            color=alt.Color("Medal:N", legend=alt.Legend(title="Medal")),
-            tooltip=[
-                alt.Tooltip("Year:O"),
-                alt.Tooltip("Medal:N"),
-                alt.Tooltip("Count:Q")
-            ]
-        )
-        .add_selection(
-            selection
-        )
-        .transform_filter(
-            selection
-        )
-        .properties(width=600, height=300)
-    )
-    st.altair_chart(stacked_bar, use_container_width=True)
-
-
-    st.subheader("4) Host City Map")
-
-    world = alt.topo_feature(data.world_110m.url, feature="countries")
-    base_map = (
-        alt.Chart(world)
-        .mark_geoshape(fill="lightgray", stroke="white")
-        .properties(width=700, height=400)
-        .project("naturalEarth1")
-    )
-
-    city_points = (
-        alt.Chart(city_summary)
-        .mark_circle(color="red", opacity=0.6)
-        .encode(
-            longitude=alt.Longitude("Longitude:Q"),
-            latitude=alt.Latitude("Latitude:Q"),
-            size=alt.Size("CityMedals:Q", scale=alt.Scale(range=[0, 1000])),
-            tooltip=[
-                alt.Tooltip("City:N"),
-                alt.Tooltip("Year:O"),
-                alt.Tooltip("CityMedals:Q")
-            ]
-        )
-        .interactive()  
-    )
-    city_map = base_map + city_points
-    st.altair_chart(city_map, use_container_width=True)
-
-
-    st.subheader("5) Bubble Chart of (Year vs. Country)")
-
-    bubble_chart = (
-        alt.Chart(year_country_medals)
-        .mark_circle()
-        .encode(
-            x=alt.X("Year:O", sort=all_years, title="Year"),
-            y=alt.Y("Country:N", sort=alt.SortField("Country", order="ascending")),
-            size=alt.Size("MedalsWon:Q", scale=alt.Scale(range=[0, 1000])),
-            color=alt.Color("MedalsWon:Q", scale=alt.Scale(scheme="blues"), legend=None),
-            tooltip=[
-                alt.Tooltip("Year:O"),
-                alt.Tooltip("Country:N"),
-                alt.Tooltip("MedalsWon:Q")
-            ]
-        )
-        .properties(width=700, height=400)
-        .interactive()  
-    )
-    st.altair_chart(bubble_chart, use_container_width=True)
-
-
-    st.subheader("6) Medal Breakdown for a Selected (Year, Country)")
-    col_a, col_b = st.columns(2)
-
-    with col_a:
-
-        possible_years = sorted(df_filtered["Year"].unique())
-        selected_breakdown_year = st.selectbox(
-            "Select Year for Breakdown:",
-            options=possible_years
-        )
-
-    with col_b:
-
-        possible_countries = sorted(df_filtered["Country"].unique())
-        selected_breakdown_country = st.selectbox(
-            "Select Country for Breakdown:",
-            options=possible_countries
-        )
-
-
-    breakdown_filtered = breakdown_full[
-        (breakdown_full["Year"] == selected_breakdown_year) &
-        (breakdown_full["Country"] == selected_breakdown_country)
-    ]
-
-    breakdown_chart = (
-        alt.Chart(breakdown_filtered)
-        .mark_bar()
-        .encode(
-            x=alt.X("Medal:N", sort=["Gold","Silver","Bronze"], title="Medal Type"),
-            y=alt.Y("NumMedals:Q", title="Number of Medals"),
-            color=alt.Color("Medal:N", scale=alt.Scale(domain=["Gold", "Silver", "Bronze"],
-                                                      range=["gold", "silver", "brown"]),
-                            legend=None),
-            tooltip=[
-                alt.Tooltip("Year:O"),
-                alt.Tooltip("Country:N"),
-                alt.Tooltip("Medal:N"),
-                alt.Tooltip("NumMedals:Q")
-            ]
-        )
-        .properties(width=300, height=300)
-    )
-
-    st.altair_chart(breakdown_chart, use_container_width=False)
-
-
-    with st.expander("View Filtered Data Table"):
-        st.dataframe(df_filtered)
-
-    st.markdown("---")
-
-if __name__ == "__main__":
-    main()
+
+import json
+import os
+
+import streamlit as st
+import numpy as np
+import pandas as pd
+import altair as alt
+from vega_datasets import data  
+
+OLYMPICS_JSON = "olympics.json"
+# Bump the version whenever convert_olympics_json changes its output.
+OLYMPICS_PARQUET = "olympics.v1.parquet"
+TABLE_ROW_LIMIT = 1000
+# Text columns only the data table shows.
+TABLE_ONLY_TEXT = ("Discipline","NOC","Event")
+# Coordinates depend only on City, so the cube leaves them out.
+CUBE_KEYS = ["Year","Sport","Country","Gender","Medal","City"]
+
+# Dense layers are drawn on one canvas instead of one SVG node per mark.
+CANVAS_RENDERER = {"embedOptions": {"renderer": "canvas"}}
+
+# Fixed projection for the 700x400 map, so Vega does not refit it per render.
+MAP_PROJECTION = {"type": "naturalEarth1", "scale": 125, "translate": [350, 200]}
+
+def breakdown_spec(medal_colors):
+    # A plain Vega-Lite dict built at import, not an Altair chain per rerun.
+    return {
+        "mark": "bar",
+        "encoding": {
+            "x": {"field": "Medal", "type": "nominal", "sort": ["Gold","Silver","Bronze"], "title": "Medal Type"},
+            "y": {"field": "NumMedals", "type": "quantitative", "title": "Number of Medals"},
+            "color": {
+                "field": "Medal",
+                "type": "nominal",
+                "scale": {"domain": ["Gold", "Silver", "Bronze"], "range": medal_colors},
+                "legend": None
+            },
+            "tooltip": [
+                {"field": "Year", "type": "ordinal"},
+                {"field": "Country", "type": "nominal"},
+                {"field": "Medal", "type": "nominal"},
+                {"field": "NumMedals", "type": "quantitative"}
+            ]
+        },
+        "width": 300,
+        "height": 300
+    }
+
+def project_natural_earth(lon, lat):
+    # NumPy port of d3.geoNaturalEarth1 with MAP_PROJECTION, in map pixels.
+    lam = np.radians(np.asarray(lon, dtype=np.float64))
+    phi = np.radians(np.asarray(lat, dtype=np.float64))
+    phi2 = phi * phi
+    phi4 = phi2 * phi2
+    x = lam * (0.8707 - 0.131979 * phi2 + phi4 * (-0.013791 + phi4 * (0.003971 * phi2 - 0.001529 * phi4)))
+    y = phi * (1.007226 + phi2 * (0.015085 + phi4 * (-0.044475 + 0.028874 * phi2 - 0.005916 * phi4)))
+    k = MAP_PROJECTION["scale"]
+    tx, ty = MAP_PROJECTION["translate"]
+    return tx + k * x, ty - k * y
+
+def convert_olympics_json():
+    # A flat list of records, so json.load + from_records beats pd.read_json.
+    with open(OLYMPICS_JSON, "rb") as f:
+        df = pd.DataFrame.from_records(json.load(f))
+    # Categoricals, so filters and aggregates work on integer codes.
+    for c in ("Sport","Country","Gender","City","Medal") + TABLE_ONLY_TEXT:
+        df[c] = df[c].astype("category")
+    df["Year"] = pd.to_numeric(df["Year"], downcast="integer")
+    df["Latitude"] = pd.to_numeric(df["Latitude"], downcast="float")
+    df["Longitude"] = pd.to_numeric(df["Longitude"], downcast="float")
+    # Stored in Year order so the year-range filter can binary search.
+    df = df.sort_values("Year", kind="mergesort", ignore_index=True)
+    # Renamed into place so no session ever reads a partial file.
+    partial = f"{OLYMPICS_PARQUET}.{os.getpid()}.tmp"
+    df.to_parquet(partial, compression="zstd")
+    os.replace(partial, OLYMPICS_PARQUET)
+
+def olympics_parquet():
+    if (
+        not os.path.exists(OLYMPICS_PARQUET)
+        or os.path.getmtime(OLYMPICS_PARQUET) < os.path.getmtime(OLYMPICS_JSON)
+    ):
+        convert_olympics_json()
+    return OLYMPICS_PARQUET
+
+def read_olympics(columns=None):
+    # numpy-backed, so categoricals keep the .cat codes category_mask reads.
+    return pd.read_parquet(olympics_parquet(), columns=columns)
+
+@st.cache_data
+def load_data():
+    # Only the filter and chart keys are read from the file.
+    return read_olympics(columns=CUBE_KEYS)
+
+@st.cache_resource
+def load_options():
+    # Categories and Year are already sorted, so nothing is sorted on rerun.
+    df = load_data()
+    return {
+        "years": tuple(df["Year"].unique().tolist()),
+        "sports": tuple(df["Sport"].cat.categories),
+        "countries": tuple(df["Country"].cat.categories),
+        "genders": tuple(df["Gender"].cat.categories),
+    }
+
+# Read-only frames, shared across sessions instead of unpickled per call.
+@st.cache_resource
+def load_table():
+    # Every column, for the optional data table only.
+    return read_olympics()
+
+@st.cache_resource
+def load_cube():
+    # Medal counts per CUBE_KEYS combination, Year-sorted for filter_rows.
+    return (
+        load_data()
+        .groupby(CUBE_KEYS, observed=True)
+        .size()
+        .reset_index(name="N")
+    )
+
+@st.cache_resource
+def load_host_cities():
+    # One row per Games: its host city and projected map position.
+    hosts = (
+        read_olympics(columns=["Year","City","Latitude","Longitude"])
+        .drop_duplicates("Year")
+    )
+    x, y = project_natural_earth(hosts["Longitude"], hosts["Latitude"])
+    return pd.DataFrame(
+        {"City": hosts["City"].array, "x": x.astype("float32"), "y": y.astype("float32")},
+        index=pd.Index(hosts["Year"]),
+    )
+
+def category_mask(col, selected, rows):
+    # Mask over col[rows] from a per-code lookup (the trailing slot drops
+    # code -1); None when every category is selected.
+    if selected is None:
+        return None
+    position = {label: code for code, label in enumerate(col.cat.categories)}
+    allowed = np.zeros(len(position) + 1, dtype=bool)
+    allowed[[position[label] for label in selected if label in position]] = True
+    if allowed[:-1].all():
+        return None
+    return allowed[col.cat.codes.to_numpy()[rows]]
+
+def filter_rows(df, min_year, max_year, sports, countries, genders):
+    # Positions of the rows passing the filters (None keeps a whole column).
+    # df is Year-sorted, so the year range is a binary-searched slice.
+    years = df["Year"].to_numpy()
+    lo = np.searchsorted(years, min_year, side="left")
+    hi = np.searchsorted(years, max_year, side="right")
+    # A multiselect cleared to nothing matches no rows: skip the masks.
+    selections = (sports, countries, genders)
+    if any(selected is not None and not len(selected) for selected in selections):
+        return slice(lo, lo)
+    year_rows = slice(lo, hi)
+    masks = [
+        mask
+        for mask in (
+            category_mask(df["Sport"], sports, year_rows),
+            category_mask(df["Country"], countries, year_rows),
+            category_mask(df["Gender"], genders, year_rows),
+        )
+        if mask is not None
+    ]
+    if not masks:
+        return year_rows
+    return lo + np.flatnonzero(np.logical_and.reduce(masks))
+
+def aggregate_medals(cube, hosts, rows=slice(None)):
+    # Summed once at (Year, Country, Medal); coarser aggregates roll up.
+    year_country_medal = (
+        cube.iloc[rows]
+        .groupby(["Year","Country","Medal"], observed=True)["N"]
+        .sum()
+    )
+
+    medal_distribution = (
+        year_country_medal
+        .groupby(level=["Year","Medal"], observed=True)
+        .sum()
+        .reset_index(name="Count")
+    )
+
+    year_country_medals = (
+        year_country_medal
+        .groupby(level=["Year","Country"], observed=True)
+        .sum()
+        .reset_index(name="MedalsWon")
+    )
+
+    # One host city per Games, so the city counts are the yearly totals.
+    year_totals = year_country_medal.groupby(level="Year").sum()
+    city_summary = year_totals.rename("CityMedals").to_frame().join(hosts).reset_index()
+
+    # Sorted by (Year, Country), so each breakdown pair is one slice.
+    breakdown_full = year_country_medal.reset_index(name="NumMedals")
+    pair_sizes = breakdown_full.groupby(["Year","Country"], observed=True).size()
+    ends = np.cumsum(pair_sizes.to_numpy())
+    breakdown_rows = {
+        pair: slice(end - n, end)
+        for pair, n, end in zip(pair_sizes.index, pair_sizes.tolist(), ends.tolist())
+    }
+
+    return {
+        "medal_distribution": medal_distribution,
+        "year_country_medals": year_country_medals,
+        "city_summary": city_summary,
+        "breakdown_full": breakdown_full,
+        "breakdown_rows": breakdown_rows,
+        "record_count": int(year_totals.sum()),
+        "breakdown_years": tuple(year_totals.index.tolist()),
+        "breakdown_countries": tuple(sorted(year_country_medals["Country"].unique())),
+    }
+
+def top_countries_per_year(year_country_medals, top_k):
+    # Top top_k countries per year plus an "Other" bubble; 0 keeps all.
+    if not top_k:
+        return year_country_medals
+    keep = (
+        year_country_medals.groupby("Year")["MedalsWon"]
+        .rank(method="first", ascending=False)
+        <= top_k
+    )
+    other = (
+        year_country_medals[~keep]
+        .groupby("Year")["MedalsWon"]
+        .sum()
+        .reset_index()
+        .assign(Country="Other")
+    )
+    return pd.concat([year_country_medals[keep], other], ignore_index=True)
+
+@st.cache_resource
+def world_basemap():
+    # A URL the browser fetches and caches, rather than inlined per spec.
+    world = alt.topo_feature(data.world_110m.url, feature="countries")
+    return (
+        alt.Chart(world)
+        .mark_geoshape(fill="lightgray", stroke="white")
+        .properties(width=700, height=400)
+        .project(**MAP_PROJECTION)
+    )
+
+@st.cache_resource
+def default_aggregates():
+    # The default view, kept out of compute_aggregates' bounded cache.
+    return aggregate_medals(load_cube(), load_host_cities())
+
+@st.cache_resource(max_entries=64)
+def compute_aggregates(min_year, max_year, sports, countries, genders):
+    # Keyed on the sidebar filters, so breakdown picks skip the groupbys.
+    cube = load_cube()
+    rows = filter_rows(cube, min_year, max_year, sports, countries, genders)
+    if isinstance(rows, slice) and rows == slice(0, len(cube)):
+        return default_aggregates()
+    return aggregate_medals(cube, load_host_cities(), rows)
+
+def selection_key(selected, options):
+    # None when every option is picked, else the selection in a fixed order.
+    if len(selected) == len(options):
+        return None
+    return tuple(sorted(selected))
+
+def overview_data(min_year, max_year, sports, countries, genders, bubble_top_k):
+    # The frames and year order both variants' charts 2-5 are drawn from.
+    aggregates = compute_aggregates(min_year, max_year, sports, countries, genders)
+    year_country_medals = top_countries_per_year(
+        aggregates["year_country_medals"], bubble_top_k
+    )
+    # Alphabetical, with the "Other" bubble pinned below the real countries.
+    country_order = sorted(
+        year_country_medals["Country"].unique(), key=lambda c: (c == "Other", c)
+    )
+    return (
+        aggregates["medal_distribution"],
+        year_country_medals,
+        country_order,
+        aggregates["city_summary"],
+        load_options()["years"],
+    )
+
+@st.cache_resource(max_entries=64)
+def overview_spec(min_year, max_year, sports, countries, genders, bubble_top_k):
+    # Cached per filter combination and shared; Streamlit copies it shallowly.
+    (
+        medal_distribution,
+        year_country_medals,
+        country_order,
+        city_summary,
+        all_years,
+    ) = overview_data(min_year, max_year, sports, countries, genders, bubble_top_k)
+
+    # One vconcat view, so a clicked year highlights across charts in-browser.
+    zoom = alt.selection_interval(bind='scales', encodings=['x'])
+    year_select = alt.selection_point(fields=['Year'], on='click', nearest=True)
+    year_opacity = alt.condition(year_select, alt.value(1.0), alt.value(0.2))
+
+    # Yearly totals are summed in the browser from the medal distribution.
+    area_chart = (
+        alt.Chart(medal_distribution)
+        .transform_aggregate(TotalMedals="sum(Count)", groupby=["Year"])
+        .mark_area(opacity=0.6, point=True)
+        .encode(
+            x=alt.X("Year:O", sort=all_years, title="Year"),
+            y=alt.Y("TotalMedals:Q", title="Total Medals"),
+            tooltip=[
+                alt.Tooltip("Year:O"),
+                alt.Tooltip("TotalMedals:Q")
+            ]
+        )
+        .add_params(
+            zoom,
+            year_select
+        )
+        .properties(width=600, height=300, title="Total Medals Over Time")
+    )
+
+    stacked_bar = (
+        alt.Chart(medal_distribution)
+        .mark_bar()
+        .encode(
+            x=alt.X("Year:O", sort=all_years, title="Year"),
+            y=alt.Y("Count:Q", stack="normalize", title="Proportion of Medals"),
+            color=alt.Color("Medal:N", legend=alt.Legend(title="Medal")),
+            opacity=year_opacity,
+            tooltip=[
+                alt.Tooltip("Year:O"),
+                alt.Tooltip("Medal:N"),
+                alt.Tooltip("Count:Q")
+            ]
+        )
+        .add_params(
+            year_select
+        )
+        .properties(width=600, height=300, title="Medal Distribution by Year")
+    )
+
+    base_map = world_basemap()
+
+    city_points = (
+        alt.Chart(city_summary)
+        .mark_circle(color="red")
+        .encode(
+            x=alt.X("x:Q", scale=None, axis=None),
+            y=alt.Y("y:Q", scale=None, axis=None),
+            size=alt.Size("CityMedals:Q", scale=alt.Scale(range=[0, 1000])),
+            opacity=alt.condition(year_select, alt.value(0.6), alt.value(0.1)),
+            tooltip=[
+                alt.Tooltip("City:N"),
+                alt.Tooltip("Year:O"),
+                alt.Tooltip("CityMedals:Q")
+            ]
+        )
+    )
+    city_map = (base_map + city_points).properties(title="Host City Map")
+
+    bubble_chart = (
+        alt.Chart(year_country_medals)
+        .mark_circle()
+        .encode(
+            x=alt.X("Year:O", sort=all_years, title="Year"),
+            y=alt.Y("Country:N", sort=country_order),
+            size=alt.Size("MedalsWon:Q", scale=alt.Scale(range=[0, 1000])),
+            color=alt.Color("MedalsWon:Q", scale=alt.Scale(scheme="blues"), legend=None),
+            opacity=year_opacity,
+            tooltip=[
+                alt.Tooltip("Year:O"),
+                alt.Tooltip("Country:N"),
+                alt.Tooltip("MedalsWon:Q")
+            ]
+        )
+        .properties(width=700, height=400, title="Bubble Chart of (Year vs. Country)")
+    )
+
+    overview = (
+        alt.vconcat(area_chart, stacked_bar, city_map, bubble_chart)
+        .resolve_scale(color="independent", size="independent", opacity="independent")
+        .properties(usermeta=CANVAS_RENDERER)
+    )
+    return overview.to_dict()
+
+@st.cache_resource(max_entries=64)
+def colorbrewer_overview_spec(min_year, max_year, sports, countries, genders, bubble_top_k):
+    # Charts 2-5 with ColorBrewer palettes, cached like overview_spec.
+    (
+        medal_distribution,
+        year_country_medals,
+        country_order,
+        city_summary,
+        all_years,
+    ) = overview_data(min_year, max_year, sports, countries, genders, bubble_top_k)
+
+    zoom = alt.selection_interval(bind='scales', encodings=['x'])
+
+    area_chart = (
+        alt.Chart(medal_distribution)
+        .transform_aggregate(TotalMedals="sum(Count)", groupby=["Year"])
+        .mark_area(opacity=0.6)
+        .encode(
+            x=alt.X("Year:O", title="Year", sort=all_years),
+            y=alt.Y("TotalMedals:Q", title="Total Medals"),
+            tooltip=[alt.Tooltip("Year:O"), alt.Tooltip("TotalMedals:Q")]
+        )
+        .add_params(zoom)
+        .properties(width=600, height=300, title="Total Medals Over Time (Area Chart)")
+        .interactive()
+    )
+
+    selection = alt.selection_point(
+        fields=['Year'],
+        empty=True,
+        on='click',
+        nearest=True
+    )
+
+    stacked_bar = (
+        alt.Chart(medal_distribution)
+        .mark_bar()
+        .encode(
+            x=alt.X("Year:O", sort=all_years, title="Year"),
+            y=alt.Y("Count:Q", stack="normalize", title="Proportion of Medals"),
+            color=alt.Color(
+                "Medal:N",
+                legend=alt.Legend(title="Medal"),
+                scale=alt.Scale(scheme="set2")
+            ),
+            tooltip=["Year:O", "Medal:N", "Count:Q"]
+        )
+        .add_params(selection)
+        .transform_filter(selection)
+        .properties(width=600, height=300, title="Medal Distribution by Year (Stacked Bar)")
+    )
+
+    city_points = (
+        alt.Chart(city_summary)
+        .mark_circle(opacity=0.6, color="red")
+        .encode(
+            x=alt.X("x:Q", scale=None, axis=None),
+            y=alt.Y("y:Q", scale=None, axis=None),
+            size=alt.Size("CityMedals:Q", scale=alt.Scale(range=[0, 1000])),
+            tooltip=["City:N", "Year:O", "CityMedals:Q"]
+        )
+        .transform_filter(selection)
+    )
+    city_map = (world_basemap() + city_points).properties(title="Host City Map")
+
+    bubble_chart = (
+        alt.Chart(year_country_medals)
+        .mark_circle()
+        .encode(
+            x=alt.X("Year:O", sort=all_years, title="Year"),
+            y=alt.Y("Country:N", sort=country_order),
+            size=alt.Size("MedalsWon:Q", scale=alt.Scale(range=[0,1000])),
+            color=alt.Color(
+                "MedalsWon:Q",
+                legend=None,
+                scale=alt.Scale(scheme="yellowgreenblue")
+            ),
+            tooltip=["Year:O", "Country:N", "MedalsWon:Q"]
+        )
+        .properties(width=700, height=400, title="Bubble Chart of (Year vs. Country)")
+    )
+
+    # One Vega view, so a year clicked in the bar chart filters the map.
+    overview = (
+        alt.vconcat(area_chart, stacked_bar, city_map, bubble_chart)
+        .resolve_scale(color="independent", size="independent")
+        .properties(usermeta=CANVAS_RENDERER)
+    )
+    return overview.to_dict()
+
+def render_overview(build_spec, filter_key, bubble_top_k):
+    st.subheader("2) Medals Over Time, Host Cities and Countries")
+    st.vega_lite_chart(build_spec(*filter_key, bubble_top_k), width="content")
+
+# DV_class.py and ex2.py differ only in title, charts 2-5 and palette.
+VARIANTS = {
+    "linked": {
+        "title": "Winter Olympics Medal Explorer (1924 – 2006)",
+        "overview_spec": overview_spec,
+        "breakdown_spec": breakdown_spec(["gold", "silver", "brown"]),
+        "note": None,
+    },
+    "color-corrected": {
+        "title": "Winter Olympics Medal Explorer (1924 – 2006) – Color Corrected",
+        "overview_spec": colorbrewer_overview_spec,
+        "breakdown_spec": breakdown_spec(["#1b9e77", "#d95f02", "#7570b3"]),
+        "note": (
+            "**Note**: We use lowercase ColorBrewer scheme names (`'set2'`, `'yellowgreenblue'`, etc.) "
+            "which are recognized by Altair v5. This ensures color scale validity and avoids schema "
+            "validation errors."
+        ),
+    },
+}
+
+def show_table_page(table, rows):
+    # Only the selected page of rows is gathered and sent to the browser.
+    if isinstance(rows, slice):
+        rows = np.arange(rows.start, rows.stop)
+    n_pages = max(1, -(-len(rows) // TABLE_ROW_LIMIT))
+    page = st.number_input("Page", min_value=1, max_value=n_pages, value=1, step=1)
+    start = (page - 1) * TABLE_ROW_LIMIT
+    page_rows = table.take(rows[start:start + TABLE_ROW_LIMIT])
+    st.caption(
+        f"Showing {len(page_rows)} of {len(rows)} records (page {page} of {n_pages})."
+    )
+    st.dataframe(page_rows)
+    # Every matching row, but only gathered and encoded when clicked.
+    st.download_button(
+        "Download filtered rows (CSV)",
+        data=lambda: table.take(rows).to_csv(index=False),
+        file_name="olympics_filtered.csv",
+        mime="text/csv",
+        on_click="ignore",
+    )
+
+def main(variant="linked"):
+    settings = VARIANTS[variant]
+
+    st.set_page_config(page_title="Winter Olympics Explorer", layout="wide")
+    st.title(settings["title"])
+
+
+    options = load_options()
+
+    st.sidebar.header("1) Data Filters")
+
+    # A form batches filter edits into one rerun on submit.
+    filters = st.sidebar.form("filters")
+
+    all_years = options["years"]
+    min_year, max_year = filters.select_slider(
+        "Select Year Range:",
+        options=all_years,
+        value=(min(all_years), max(all_years))
+    )
+
+    all_sports = options["sports"]
+    selected_sports = filters.multiselect(
+        "Select Sports:",
+        options=all_sports,
+        default=all_sports
+    )
+
+    all_countries = options["countries"]
+    selected_countries = filters.multiselect(
+        "Select Countries:",
+        options=all_countries,
+        default=all_countries
+    )
+
+    all_genders = options["genders"]
+    selected_genders = filters.multiselect(
+        "Select Genders:",
+        options=all_genders,
+        default=all_genders
+    )
+
+    # Opt-in cap on bubble chart marks; "All" stays the default.
+    bubble_top_k = filters.selectbox(
+        "Bubble Chart Countries per Year:",
+        options=(0, 5, 10, 20, 50),
+        format_func=lambda k: "All" if k == 0 else f"Top {k}"
+    )
+
+    filters.form_submit_button("Apply Filters")
+
+    filter_key = (
+        min_year,
+        max_year,
+        selection_key(selected_sports, all_sports),
+        selection_key(selected_countries, all_countries),
+        selection_key(selected_genders, all_genders),
+    )
+    aggregates = compute_aggregates(*filter_key)
+    breakdown_full = aggregates["breakdown_full"]
+
+    st.sidebar.markdown(f"**Records after filtering:** {aggregates['record_count']}")
+
+    # Nothing to chart when no records match.
+    if not aggregates["record_count"]:
+        st.warning("No records match the selected filters.")
+        return
+
+    render_overview(settings["overview_spec"], filter_key, bubble_top_k)
+
+
+    st.subheader("3) Medal Breakdown for a Selected (Year, Country)")
+    col_a, col_b = st.columns(2)
+
+    with col_a:
+
+        selected_breakdown_year = st.selectbox(
+            "Select Year for Breakdown:",
+            options=aggregates["breakdown_years"]
+        )
+
+    with col_b:
+
+        selected_breakdown_country = st.selectbox(
+            "Select Country for Breakdown:",
+            options=aggregates["breakdown_countries"]
+        )
+
+
+    breakdown_rows = aggregates["breakdown_rows"].get(
+        (selected_breakdown_year, selected_breakdown_country), slice(0, 0)
+    )
+    breakdown_filtered = breakdown_full.iloc[breakdown_rows]
+
+    st.vega_lite_chart(breakdown_filtered, settings["breakdown_spec"], width="content")
+
+
+    with st.expander("View Filtered Data Table"):
+        # Raw rows are only sent on request, a page at a time.
+        if st.checkbox("Show table"):
+            table = load_table()
+            show_table_page(table, filter_rows(table, *filter_key))
+
+    st.markdown("---")
+    if settings["note"]:
+        st.markdown(settings["note"])
+
+if __name__ == "__main__":
+    main()
@@ -1,30 +1,69 @@
 import streamlit as st
+import numpy as np
 import pandas as pd
 import altair as alt
 from vega_datasets import data
 
+@st.cache_data
+def load_data():
+    # Parsed once per process. The numeric columns are downcast to the
+    # narrowest integer their values fit, so nothing can overflow.
+    df = pd.read_csv("West_Nile_Virus_by_County.csv", dtype={"County": "category"})
+    df["Week_Reported"] = pd.to_numeric(df["Week_Reported"], errors="coerce", downcast="integer")
+    for col in ("Year", "id", "Positive_Cases"):
+        df[col] = pd.to_numeric(df[col], downcast="integer")
+    return df
+
+@st.cache_resource
+def load_years():
+    return tuple(sorted(load_data()["Year"].unique().tolist()))
+
+@st.cache_data
+def county_totals(year):
+    # Cached per year. Keys are small integers (FIPS codes, category codes,
+    # week numbers), so the sums are one np.bincount over the key; the
+    # observed groups are the keys with any rows, even if they sum to 0.
+    df = load_data()
+    year_df = df[df["Year"] == year]
+    ids = year_df["id"].to_numpy()
+    totals = np.bincount(ids, weights=year_df["Positive_Cases"].to_numpy())
+    ids = np.flatnonzero(np.bincount(ids))
+    return pd.DataFrame({"id": ids.astype(df["id"].dtype), "TotalCases": totals[ids].astype("int64")})
+
+@st.cache_data
+def weekly_totals(year):
+    df = load_data()
+    # Weeks that failed to parse are NaN; groupby would drop them too.
+    year_df = df[(df["Year"] == year) & df["Week_Reported"].notna()]
+    # County and week fold into one key, County-major like groupby's order.
+    shape = (len(df["County"].cat.categories), int(df["Week_Reported"].max()) + 1)
+    keys = np.ravel_multi_index(
+        (year_df["County"].cat.codes.to_numpy(), year_df["Week_Reported"].to_numpy().astype(np.intp)), shape
+    )
+    totals = np.bincount(keys, weights=year_df["Positive_Cases"].to_numpy(), minlength=shape[0] * shape[1])
+    cells = np.flatnonzero(np.bincount(keys, minlength=shape[0] * shape[1]))
+    county, week = np.unravel_index(cells, shape)
+    return pd.DataFrame({
+        "County": pd.Categorical.from_codes(county, dtype=df["County"].dtype),
+        "Week_Reported": week.astype(df["Week_Reported"].dtype),
+        "Positive_Cases": totals[cells].astype("int64"),
+    })
+
 def main():
     st.title("West Nile Virus in California: Map + Weekly Chart")
 
-    df = pd.read_csv("West_Nile_Virus_by_County.csv")
+    df = load_data()
 
     required_cols = {"Year", "Week_Reported", "County", "id", "Positive_Cases"}
     if not required_cols.issubset(df.columns):
         st.error(f"Missing required columns: {required_cols}")
         st.stop()
 
-    df["Week_Reported"] = pd.to_numeric(df["Week_Reported"], errors="coerce")
-
-    years = sorted(df["Year"].unique())
-    selected_year = st.sidebar.selectbox("Select Year", years, index=0)
+    selected_year = st.sidebar.selectbox("Select Year", load_years(), index=0)
 
     year_df = df[df["Year"] == selected_year]
 
-    county_agg = (
-        year_df.groupby("id", as_index=False)["Positive_Cases"]
-        .sum()
-        .rename(columns={"Positive_Cases": "TotalCases"})
-    )
+    county_agg = county_totals(selected_year)
 
     counties = alt.topo_feature(data.us_10m.url, "counties")
 
@@ -63,19 +102,17 @@ def main():
 
     st.subheader("Weekly Positive Cases by County")
 
+    # Counties are picked by clicking (shift-click for several) the chart's
+    # legend, which Vega handles in the browser; only a year change reruns
+    # the script, so the weekly sums cover every county of the year.
     all_counties = sorted(year_df["County"].unique())
-    selected_counties = st.sidebar.multiselect(
-        "Select Counties (for line chart)",
-        all_counties,
-        default=all_counties[:5]  
+    county_select = alt.selection_point(
+        fields=["County"],
+        bind="legend",
+        value=[{"County": county} for county in all_counties[:5]],
     )
 
-    line_df = year_df[year_df["County"].isin(selected_counties)]
-
-    weekly_agg = (
-        line_df.groupby(["County", "Week_Reported"], as_index=False)["Positive_Cases"]
-        .sum()
-    )
+    weekly_agg = weekly_totals(selected_year)
 
     line_chart = (
         alt.Chart(weekly_agg)
@@ -88,9 +125,11 @@ def main():
             ),
             y=alt.Y("Positive_Cases:Q", title="Positive Cases"),
             color="County:N",
+            opacity=alt.condition(county_select, alt.value(1), alt.value(0.05)),
             tooltip=["County:N", "Week_Reported:Q", "Positive_Cases:Q"]
         )
         .properties(width=700, height=400, title=f"Weekly Positive Cases ({selected_year})")
+        .add_params(county_select)
         .interactive()
     )
 
@@ -1,7 +1,15 @@
 import streamlit as st
+import numpy as np
 import pandas as pd
 import json
-import plotly.express as px
+import plotly.graph_objects as go
+
+# us-states.json simplified to ~0.05 degrees (below a pixel at the
+# full-country view) and rounded to 3 decimals. It is served from ./static
+# (server.enableStaticServing), so figures reference it by URL and the
+# browser fetches it once instead of receiving it inside every figure.
+STATES_GEOJSON = "static/us-states.min.json"
+STATES_GEOJSON_URL = "app/static/us-states.min.json"
 
 st.set_page_config(page_title="US CO₂ Emissions & Population Dashboard", layout="wide")
 
@@ -21,18 +29,70 @@ The goal is to answer questions like:
 
 @st.cache_data
 def load_data():
+    # Population values carry thousands separators ("4,050,055"); without
+    # thousands="," the whole Value column would be read as strings.
+    # State and Sector repeat a few dozen labels, so they are categoricals.
+    df = pd.read_csv("co2-population.csv", thousands=",", dtype={"State": "category", "Sector": "category"})
 
-    df = pd.read_csv("co2-population.csv")
-
-    with open("us-states.json") as f:
+    # The outlines are read server-side only for their FIPS ids.
+    with open(STATES_GEOJSON) as f:
         states_geo = json.load(f)
-    return df, states_geo
 
-df, states_geo = load_data()
+    # The FIPS column is added here, once per process, rather than by
+    # re-mapping the State column on every rerun. Only name -> FIPS is
+    # needed: the map's hover reads the State column directly, so nothing
+    # looks a name up from a FIPS code.
+    state_to_fips = {feature["properties"]["name"]: feature["id"] for feature in states_geo["features"]}
+    df["fips"] = df["State"].map(state_to_fips)
 
+    # Row positions per (Sector, Year), so the map filter is a dict lookup
+    # instead of full-column compares.
+    sector_year_rows = df.groupby(["Sector", "Year"]).indices
+    return df, sector_year_rows
 
-state_to_fips = {feature["properties"]["name"]: feature["id"] for feature in states_geo["features"]}
-df["fips"] = df["State"].map(state_to_fips)
+@st.cache_data
+def load_trends():
+    # Each (State, Sector) time series is one column of a Year-indexed
+    # table, so a trend trace is a single column fetch.
+    df = load_data()[0]
+    return df.pivot(index="Year", columns=["State", "Sector"], values="Value")
+
+@st.cache_resource
+def load_options():
+    df = load_data()[0]
+    return {
+        "years": (int(df["Year"].min()), int(df["Year"].max())),
+        "sectors": tuple(df["Sector"].cat.categories),
+        "states": tuple(df["State"].cat.categories),
+    }
+
+@st.cache_resource(max_entries=64)
+def build_map(sector, year):
+    # Figures are built once per (sector, year) and shared: st.plotly_chart
+    # only reads the figure it is given, so sweeping the year slider back
+    # and forth reuses them.
+    # Only the columns the trace shows are sent, and only states with an
+    # outline: the national "USA" rows have no FIPS code to draw.
+    df, sector_year_rows = load_data()
+    no_rows = np.array([], dtype=np.intp)
+    df_map = df.iloc[sector_year_rows.get((sector, year), no_rows)]
+    df_map = df_map[df_map["fips"].notna()]
+    label = f"{sector} {'Population' if sector=='Population' else 'Emissions (million metric tons CO₂)'}"
+
+    # A geo choropleth trace built directly, without plotly express.
+    fig_map = go.Figure(go.Choropleth(
+        geojson=STATES_GEOJSON_URL,
+        locations=df_map["fips"].tolist(),
+        z=df_map["Value"].tolist(),
+        colorscale="Viridis",
+        colorbar={"title": {"text": label}},
+        hovertext=df_map["State"].tolist(),
+        hovertemplate=f"<b>%{{hovertext}}</b><br><br>Year={year}<br>{label}=%{{z}}<extra></extra>",
+    ))
+    fig_map.update_layout(geo={"scope": "usa"}, margin={"r":0, "t":0, "l":0, "b":0})
+    return fig_map
+
+options = load_options()
 
 
 st.sidebar.title("Visualization Settings")
@@ -41,48 +101,46 @@ viz_type = st.sidebar.radio("Choose Visualization Type", ["Map View", "Trend Ana
 if viz_type == "Map View":
     st.sidebar.header("Map Filters")
 
+    first_year, last_year = options["years"]
     selected_year = st.sidebar.slider("Select Year", 
-                                      min_value=int(df["Year"].min()), 
-                                      max_value=int(df["Year"].max()), 
-                                      value=int(df["Year"].min()))
+                                      min_value=first_year, 
+                                      max_value=last_year, 
+                                      value=first_year)
 
-    sectors = sorted(df["Sector"].unique().tolist())
-    selected_sector = st.sidebar.selectbox("Select Sector", sectors)
+    selected_sector = st.sidebar.selectbox("Select Sector", options["sectors"])
 
-    df_map = df[(df["Year"] == selected_year) & (df["Sector"] == selected_sector)]
-    
     st.subheader(f"Choropleth Map: {selected_sector} in {selected_year}")
-    fig_map = px.choropleth(
-        df_map,
-        geojson=states_geo,
-        locations="fips",
-        color="Value",
-        color_continuous_scale="Viridis",
-        scope="usa",
-        hover_name="State",
-        hover_data={"fips": False, "Year": True, "Value": True},
-        labels={"Value": f"{selected_sector} {'Population' if selected_sector=='Population' else 'Emissions (million metric tons CO₂)'}"}
-    )
-    fig_map.update_layout(margin={"r":0, "t":0, "l":0, "b":0})
-    st.plotly_chart(fig_map, use_container_width=True)
+    st.plotly_chart(build_map(selected_sector, selected_year), use_container_width=True)
 
 elif viz_type == "Trend Analysis":
     st.sidebar.header("Trend Analysis Filters")
-    sectors = sorted(df["Sector"].unique().tolist())
-    selected_sector = st.sidebar.selectbox("Select Sector for Trend", sectors)
-    states_list = sorted(df["State"].unique().tolist())
-    selected_states = st.sidebar.multiselect("Select States", states_list, default=["California", "Texas", "New York"])
-
-    df_trend = df[(df["Sector"] == selected_sector) & (df["State"].isin(selected_states))]
+    selected_sector = st.sidebar.selectbox("Select Sector for Trend", options["sectors"])
+    selected_states = st.sidebar.multiselect("Select States", options["states"], default=["California", "Texas", "New York"])
+    trends = load_trends()
+
+    # Alphabetical like the state options, whatever order they were picked
+    # in; dropna drops the years a series has no value for.
+    state_series = [
+        (state, trends[(state, selected_sector)].dropna())
+        for state in sorted(selected_states)
+        if (state, selected_sector) in trends
+    ]
     
     st.subheader(f"Trend Analysis: {selected_sector} Over Time")
-    fig_trend = px.line(
-        df_trend,
-        x="Year",
-        y="Value",
-        color="State",
-        markers=True,
-        labels={"Value": f"{selected_sector} {'Population' if selected_sector=='Population' else 'Emissions (million metric tons CO₂)'}", "Year": "Year"}
+    # One trace per state from plain lists, so each state keeps its color.
+    fig_trend = go.Figure([
+        go.Scattergl(
+            x=series.index.tolist(),
+            y=series.tolist(),
+            mode="lines+markers",
+            name=state,
+        )
+        for state, series in state_series
+    ])
+    fig_trend.update_layout(
+        xaxis_title="Year",
+        yaxis_title=f"{selected_sector} {'Population' if selected_sector=='Population' else 'Emissions (million metric tons CO₂)'}",
+        legend_title_text="State",
     )
     st.plotly_chart(fig_trend, use_container_width=True)
 
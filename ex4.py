@@ -1,6 +1,4 @@
 import streamlit as st
-import networkx as nx
-from pyvis.network import Network
 import streamlit.components.v1 as components
 
 st.title("Bighorn Sheep Dominance Network Visualization from GraphML for my DSE class")
@@ -15,98 +13,111 @@ Nodes are augmented with computed in-degree and out-degree metrics. Hover over a
 """)
 
 
-@st.cache_data
+# vis.js options for the network page. Held as a dict so pyvis serialises
+# it as-is rather than parsing a JavaScript string on every build.
+NETWORK_OPTIONS = {
+    "nodes": {
+        "font": {"size": 16, "face": "Tahoma"},
+        "scaling": {"min": 10, "max": 30},
+    },
+    "edges": {
+        "arrows": {"to": {"enabled": True, "scaleFactor": 1}},
+        "color": {"inherit": True},
+        "smooth": False,
+    },
+    "physics": {
+        "forceAtlas2Based": {
+            "gravitationalConstant": -50,
+            "centralGravity": 0.01,
+            "springLength": 600,
+            "springConstant": 0.0008,
+        },
+        "minVelocity": 0.75,
+        "solver": "forceAtlas2Based",
+    },
+}
+
+
+def to_int(value, default):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+@st.cache_resource
 def load_graph():
+    # Parsed and augmented once per process; the graph is only read after
+    # this, so every session shares the same object.
+    # Imported on first use, like pyvis in network_html.
+    import networkx as nx
+
     # Read the GraphML file
     G = nx.read_graphml("sheep_ml.graphml.xml")
-    
-    for n, data in G.nodes(data=True):
-        if "age" in data:
-            try:
-                data["age"] = int(data["age"])
-            except ValueError:
-                data["age"] = 0  # default/fallback value
-        else:
-            data["age"] = 0
-    #  edge attribute "weight" to integer
-    for u, v, data in G.edges(data=True):
-        if "weight" in data:
-            try:
-                data["weight"] = int(data["weight"])
-            except ValueError:
-                data["weight"] = 1
-        else:
-            data["weight"] = 1
+
+    # Node ages and edge weights as integers, built as whole attribute
+    # dicts and set in one call each; missing or malformed values fall back
+    # to 0 and 1.
+    nx.set_node_attributes(G, {n: to_int(age, 0) for n, age in G.nodes(data="age")}, "age")
+    nx.set_edge_attributes(G, {(u, v): to_int(weight, 1) for u, v, weight in G.edges(data="weight")}, "weight")
+
+    # Both degrees in one pass over the nodes, written with a single call.
+    nx.set_node_attributes(G, {
+        n: {"in_degree": len(G.pred[n]), "out_degree": len(G.succ[n])} for n in G
+    })
     return G
 
+@st.cache_resource
+def network_html():
+    # Built once per process; lazy imports let the page render before pyvis.
+    from pyvis.network import Network
+    import networkx as nx
+
+    G = load_graph()
+
+    # Start every node from a precomputed spring layout (fixed seed, so each
+    # process builds the same page) instead of vis.js's random placement;
+    # physics stays on for the bounce, but it settles from a near-final
+    # layout instead of untangling the whole graph on each page load.
+    pos = nx.spring_layout(G, seed=0, scale=1000)
+
+    # Create a Pyvis network for an interactive visualization. vis.js comes
+    # from the CDN either way; "remote" inlines pyvis's small helper script
+    # too, where the default "local" links lib/bindings/utils.js, a relative
+    # path the srcdoc iframe cannot load.
+    net = Network(height="600px", width="100%", directed=True, notebook=False, cdn_resources="remote")
+
+    # Add nodes and edges straight from the graph instead of net.from_nx(G):
+    # from_nx copies every attribute and then writes "size" and "width" back
+    # into G, which is the shared cached graph.
+    for node_id, data in G.nodes(data=True):
+        age = data["age"]
+        net.add_node(
+            node_id,
+            label=str(node_id),
+            title=f"Sheep ID: {node_id}<br>Age: {age}<br>In-degree: {data['in_degree']}<br>Out-degree: {data['out_degree']}",
+            value=age,
+            x=float(pos[node_id][0]),
+            y=float(pos[node_id][1]),
+        )
+
+    for source, target, weight in G.edges(data="weight"):
+        net.add_edge(source, target, width=weight)
+
+    # set_options would only parse a JSON string back into this same dict.
+    net.options = NETWORK_OPTIONS
+
+    # The page is rendered straight to a string: no file is written and
+    # read back, and concurrent sessions never share a path on disk.
+    return net.generate_html()
+
 G = load_graph()
 
 st.subheader("Graph Overview")
 st.write(f"Number of nodes: {G.number_of_nodes()}")
 st.write(f"Number of edges: {G.number_of_edges()}")
 
-in_degree = dict(G.in_degree())
-out_degree = dict(G.out_degree())
-nx.set_node_attributes(G, in_degree, "in_degree")
-nx.set_node_attributes(G, out_degree, "out_degree")
-
-# Create a Pyvis network for an interactive visualization
-net = Network(height="600px", width="100%", directed=True, notebook=False)
-
-net.from_nx(G)
-
-for node in net.nodes:
-    node_id = node["id"]
-    age = G.nodes[node_id].get("age", "N/A")
-    in_deg = G.nodes[node_id].get("in_degree", 0)
-    out_deg = G.nodes[node_id].get("out_degree", 0)
-    node["title"] = f"Sheep ID: {node_id}<br>Age: {age}<br>In-degree: {in_deg}<br>Out-degree: {out_deg}"
-    node["value"] = age if isinstance(age, int) else 10
-    node["label"] = str(node_id)
-
-net.set_options("""
-var options = {
-  "nodes": {
-    "font": {
-      "size": 16,
-      "face": "Tahoma"
-    },
-    "scaling": {
-      "min": 10,
-      "max": 30
-    }
-  },
-  "edges": {
-    "arrows": {
-      "to": {
-        "enabled": true,
-        "scaleFactor": 1
-      }
-    },
-    "color": {
-      "inherit": true
-    },
-    "smooth": false
-  },
-  "physics": {
-    "forceAtlas2Based": {
-      "gravitationalConstant": -50,
-      "centralGravity": 0.01,
-      "springLength": 600,
-      "springConstant": 0.0008
-    },
-    "minVelocity": 0.75,
-    "solver": "forceAtlas2Based"
-  }
-}
-""")
-
-net.save_graph("sheep_network.html")
-with open("sheep_network.html", "r", encoding="utf-8") as f:
-    html_content = f.read()
-
 st.subheader("Interactive Network Visualization")
-components.html(html_content, height=600, width=800)
+components.html(network_html(), height=600, width=800)
 
 st.markdown("""
 ### Findings, and Cool features